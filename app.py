@@ -2,9 +2,18 @@ import streamlit as st
 import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
+from gspread.utils import numericise
 import plotly.graph_objects as go
 import plotly.express as px
+import logging
+import sys
+import threading
 import time
+import uuid
+from collections import namedtuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 # ==========================================
 # [설정] 파트별 문항 상세 구성
@@ -20,6 +29,22 @@ EXAM_STRUCTURE = {
     8: {"title": "Part 8. 서술형 영작 (Writing)", "type": "simple_subj", "count": 5, "level": "최상급"}
 }
 
+# 파트별 문항 ID (answers / answer_key 시트의 q_id와 동일)
+# ※ Part 2·3·5의 q_id는 하단 "제출 및 저장" 처리부의 final_data q_id와 반드시 일치해야 함
+EXAM_ITEMS = {
+    1: [str(i) for i in range(1, EXAM_STRUCTURE[1]['count']+1)],
+    2: [str(i) for i in range(1, EXAM_STRUCTURE[2]['count'])] + [f"{EXAM_STRUCTURE[2]['count']}_wrong", f"{EXAM_STRUCTURE[2]['count']}_correct"],
+    3: ["1_subj", "1_verb", "1_obj", "2_subj", "2_verb", "2_obj", "3_subj", "3_obj", "4_subj", "4_verb", "4_obj", "5_obj", "5_text"],
+    4: [str(i) for i in range(1, EXAM_STRUCTURE[4]['count']+1)],
+    5: ["1_obj", "1_text", "2_obj", "2_text", "3_text", "4_text", "5_obj", "5_text"],
+    6: [str(i) for i in range(1, EXAM_STRUCTURE[6]['count']*4+1)],  # 세트당 4문항
+    7: [str(i) for i in range(1, EXAM_STRUCTURE[7]['count']+1)],
+    8: [str(i) for i in range(1, EXAM_STRUCTURE[8]['count']+1)]
+}
+ITEM_CATALOG = [(str(p), q) for p in EXAM_ITEMS for q in EXAM_ITEMS[p]]
+CONFIDENCE_LEVELS = ["확신", "애매", "모름"]
+CONFIDENCE_CODES = {c: i for i, c in enumerate(CONFIDENCE_LEVELS)}
+
 QUADRANT_LABELS = {
     "Master": "실력자 (The Ace)",
     "Lucky": "불안한 잠재력 (Anxious Potential)",
@@ -40,30 +65,171 @@ def get_db_connection():
     client = get_client()
     return client.open("english_exam_db")
 
-@st.cache_data(ttl=600)
+# ------------------------------------------
+# 공유 메모리 저장소: 모든 세션이 하나의 인스턴스를 공유 (시트별로 따로 캐시)
+# 빌드 이후의 저장 내용은 recent에 덧붙이고, ttl이 지나면 시트에서 다시 만듦
+# ------------------------------------------
+StudentAnswers = namedtuple("StudentAnswers", ["item", "answer", "confidence", "catalog"])
+
+def _item_key(part, q_id):
+    return f"{str(part).strip()}:{str(q_id).strip()}"
+
+def _to_int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def _deep_size(a):
+    return int(pd.Series(a, copy=False).memory_usage(deep=True, index=False))
+
+class StudentStore:
+    def __init__(self, student_records):
+        self._lock = threading.Lock()
+        rows = {}
+        for r in student_records:
+            email = str(r.get('email', '')).strip().lower()
+            if not email or email in rows: continue  # 중복 시 첫 행
+            rows[email] = (str(r.get('name', '')).strip(), r.get('school', ''), r.get('grade', ''), _to_int(r.get('last_part'), 1))
+        self.emails = pd.Index(list(rows))
+        self.name = np.array([v[0] for v in rows.values()], dtype=object)
+        self.school = np.array([v[1] for v in rows.values()], dtype=object)
+        self.grade = np.array([v[2] for v in rows.values()], dtype=object)
+        self.last_part = np.array([v[3] for v in rows.values()], dtype=np.int16)
+        self.recent = {}
+
+    def _record(self, email):
+        if email in self.recent: return self.recent[email]
+        code = self.emails.get_indexer([email])[0]
+        if code < 0: return None
+        return {'email': email, 'name': self.name[code], 'school': self.school[code],
+                'grade': self.grade[code], 'last_part': int(self.last_part[code])}
+
+    def student(self, name, email):
+        rec = self._record(str(email).strip().lower())
+        return rec if rec and rec['name'] == name.strip() else None
+
+    def apply(self, email, **changes):
+        with self._lock:
+            rec = dict(self._record(email) or {'email': email, 'name': '', 'school': '', 'grade': '', 'last_part': 1})
+            rec.update(changes)
+            self.recent[email] = rec
+
+    def memory_usage(self):
+        usage = {'emails': int(self.emails.memory_usage(deep=True)),
+                 'columns': _deep_size(self.name) + _deep_size(self.school) + _deep_size(self.grade) + self.last_part.nbytes,
+                 'recent': sys.getsizeof(self.recent) + sum(sys.getsizeof(v) for v in self.recent.values())}
+        usage['total'] = sum(usage.values())
+        return usage
+
+class AnswerStore:
+    def __init__(self, answer_records):
+        self._lock = threading.Lock()
+        # 문항 코드 -> (part, q_id). 카탈로그에 없는 문항도 버리지 않고 뒤에 추가
+        self.catalog = list(ITEM_CATALOG)
+        self.item_codes = {_item_key(p, q): i for i, (p, q) in enumerate(self.catalog)}
+        ans_df = pd.DataFrame(answer_records)
+        for col in ANSWER_HEADER:
+            if col not in ans_df.columns: ans_df[col] = ""
+        email = ans_df['email'].astype(str).str.strip().str.lower()
+        keys = ans_df['part'].astype(str).str.strip() + ":" + ans_df['q_id'].astype(str).str.strip()
+        for k in keys.unique(): self._code_for(k)
+
+        # 답안: 정수 코드 컬럼 + 문자열 배열, (이메일, 문항)별 마지막 제출만 유지 (last-write-wins)
+        self.emails = pd.Index(email.unique())
+        codes = pd.DataFrame({
+            'email': self.emails.get_indexer(email).astype(np.int32),
+            'item': keys.map(self.item_codes).to_numpy(dtype=np.int16),
+            'confidence': ans_df['confidence'].map(CONFIDENCE_CODES).fillna(-1).to_numpy(dtype=np.int8),
+        })
+        codes = codes.drop_duplicates(subset=['email', 'item'], keep='last')
+        order = np.lexsort((codes['item'].to_numpy(), codes['email'].to_numpy()))
+        rows = codes.index.to_numpy()[order]
+        self.email_code = codes['email'].to_numpy()[order]
+        self.item = codes['item'].to_numpy()[order]
+        self.confidence = codes['confidence'].to_numpy()[order]
+        self.answer = pd.array(ans_df['answer'].astype(str).str.strip().to_numpy()[rows], dtype="string")
+        # 이메일 코드 c의 답안은 [offsets[c], offsets[c+1]) 구간
+        self.offsets = np.searchsorted(self.email_code, np.arange(len(self.emails) + 1))
+        self.recent = {}
+
+    def _code_for(self, key):
+        if key not in self.item_codes:
+            self.catalog.append(tuple(key.split(":", 1)))
+            self.item_codes[key] = len(self.catalog) - 1
+        return self.item_codes[key]
+
+    def apply(self, email, part, data_list):
+        with self._lock:
+            recent = dict(self.recent.get(email, {}))
+            for d in data_list:
+                # get_all_records와 같은 숫자 변환을 거쳐 시트에서 다시 만든 값과 일치시킴 ("007" -> "7")
+                recent[self._code_for(_item_key(part, d['q_id']))] = (str(numericise(str(d['ans']))).strip(), CONFIDENCE_CODES.get(d['conf'], -1))
+            self.recent[email] = recent
+
+    def answers_for(self, email):
+        email = str(email).strip().lower()
+        code = self.emails.get_indexer([email])[0]
+        lo, hi = (self.offsets[code], self.offsets[code+1]) if code >= 0 else (0, 0)
+        recent = self.recent.get(email)
+        # 빌드 이후 제출이 없으면 슬라이스만 반환하므로 복사가 일어나지 않음
+        if not recent: return StudentAnswers(self.item[lo:hi], self.answer[lo:hi], self.confidence[lo:hi], self.catalog)
+        merged = dict(zip(self.item[lo:hi].tolist(), zip(self.answer[lo:hi], self.confidence[lo:hi].tolist())))
+        merged.update(recent)
+        items = sorted(merged)
+        return StudentAnswers(np.array(items, dtype=np.int16), pd.array([merged[i][0] for i in items], dtype="string"),
+                              np.array([merged[i][1] for i in items], dtype=np.int8), self.catalog)
+
+    def memory_usage(self):
+        usage = {'emails': int(self.emails.memory_usage(deep=True)),
+                 'columns': self.email_code.nbytes + self.item.nbytes + self.confidence.nbytes + self.offsets.nbytes + _deep_size(self.answer),
+                 'recent': sys.getsizeof(self.recent) + sum(sys.getsizeof(v) for v in self.recent.values())}
+        usage['total'] = sum(usage.values())
+        return usage
+
+@st.cache_resource(ttl=600)
 def load_answer_key():
-    sh = get_db_connection()
-    ws = sh.worksheet("answer_key")
-    data = ws.get_all_records()
-    df = pd.DataFrame(data)
-    df['part'] = df['part'].astype(str)
-    df['q_id'] = df['q_id'].astype(str)
-    return df
+    ws = get_db_connection().worksheet("answer_key")
+    answer_key = {}
+    for r in ws.get_all_records():
+        k = _item_key(r.get('part', ''), r.get('q_id', ''))
+        if k not in answer_key:  # 중복 시 첫 행
+            answer_key[k] = (str(r.get('answer', '')).strip(), r.get('grading_type', ''), str(r.get('keywords', '')))
+    return answer_key
+
+@st.cache_resource
+def _built_stores():
+    return {}
+
+@st.cache_resource(ttl=600)
+def load_student_store():
+    store = StudentStore(get_db_connection().worksheet("students").get_all_records())
+    logger.info("students 저장소 생성: %s", store.memory_usage())
+    _built_stores()["students"] = store
+    return store
+
+@st.cache_resource(ttl=600)
+def load_answer_store():
+    store = AnswerStore(get_db_connection().worksheet("answers").get_all_records())
+    logger.info("answers 저장소 생성: %s", store.memory_usage())
+    _built_stores()["answers"] = store
+    return store
+
+def _apply_to_built_store(name, *args, **kwargs):
+    # 이미 만들어진 저장소에만 반영. 없으면 다음 빌드가 시트에서 읽어 오므로 건너뜀
+    store = _built_stores().get(name)
+    if store is None: return
+    try:
+        store.apply(*args, **kwargs)
+    except Exception:
+        logger.exception("%s 저장소 반영 실패", name)
 
 def get_student(name, email):
     try:
-        sh = get_db_connection()
-        ws = sh.worksheet("students")
-        data = ws.get_all_records()
-        df = pd.DataFrame(data)
-        if 'email' in df.columns:
-            df['email'] = df['email'].astype(str).str.strip().str.lower()
-            df['name'] = df['name'].astype(str).str.strip()
-            student = df[(df['name'] == name.strip()) & (df['email'] == email.strip().lower())]
-            return student.iloc[0].to_dict() if not student.empty else None
-        return None
-    except:
-        return None
+        return load_student_store().student(name, email)
+    except Exception:
+        logger.exception("students 조회 실패")
+        raise
 
 def save_student(name, email, school, grade):
     sh = get_db_connection()
@@ -76,51 +242,126 @@ def save_student(name, email, school, grade):
         ws.update_cell(cell.row, 4, grade)
     except:
         ws.append_row([email, name, school, grade, 1])
+    _apply_to_built_store("students", email, name=str(numericise(name.strip())), school=numericise(school), grade=numericise(grade))
+
+ANSWER_HEADER = ["email", "part", "q_id", "answer", "confidence", "submission_id"]
+STUDENT_SID_HEADER = "last_submission_id"
+SID_PENDING = "pending:"
+COMPACT_LEASE = 300
 
-def save_answers_bulk(email, part, data_list):
+def new_submission_id(part):
+    return f"{part}-{uuid.uuid4().hex[:12]}"
+
+def save_answers_bulk(email, part, data_list, submission_id):
     sh = get_db_connection()
-    ws = sh.worksheet("answers")
-    rows = [[email, part, d['q_id'], d['ans'], d['conf']] for d in data_list]
-    ws.append_rows(rows)
     ws_stu = sh.worksheet("students")
-    try:
-        cell = ws_stu.find(email)
-        ws_stu.update_cell(cell.row, 5, part + 1)
-    except:
-        pass
+    ws_ans = sh.worksheet("answers")
+    values = ws_stu.get_all_values()
+    email_key = str(email).strip().lower()
+    row = next((i + 1 for i, r in enumerate(values) if i > 0 and r and r[0].strip().lower() == email_key), None)
+    # 학생 행(F열)에 제출 ID를 추가 전 "pending:<id>", 추가 후 "<id>"로 기록.
+    # 같은 ID가 다시 오면 재전송으로 보고 추가하지 않음. pending 상태라면 추가 성공 여부를
+    # 알 수 없으므로 (재시도 시에만) answers의 submission_id 열에서 확인
+    last_sid = values[row - 1][5] if row and len(values[row - 1]) > 5 else ""
+    already = last_sid == submission_id or (last_sid == SID_PENDING + submission_id and submission_id in ws_ans.col_values(len(ANSWER_HEADER)))
+    if row is not None:
+        if len(values[0]) < 6 or values[0][5] != STUDENT_SID_HEADER:
+            ws_stu.update_cell(1, 6, STUDENT_SID_HEADER)
+        if not already: ws_stu.update_cell(row, 6, SID_PENDING + submission_id)
+    if not already:
+        rows = [[email, part, d['q_id'], d['ans'], d['conf'], submission_id] for d in data_list]
+        ws_ans.append_rows(rows)
+    if row is not None:
+        try:
+            ws_stu.update(range_name=f"E{row}:F{row}", values=[[part + 1, submission_id]])
+        except Exception:
+            logger.exception("진행 상황 저장 실패: %s", email_key)
+    # 시트 기록이 끝난 뒤 메모리 저장소 반영 (실패해도 저장 자체는 완료된 상태)
+    if not already: _apply_to_built_store("answers", email_key, part, data_list)
+    if row is not None: _apply_to_built_store("students", email_key, last_part=part + 1)
 
 def load_student_answers(email):
-    sh = get_db_connection()
+    return load_answer_store().answers_for(email)
+
+def compact_answers(sh):
     ws = sh.worksheet("answers")
-    data = ws.get_all_records()
-    df = pd.DataFrame(data)
-    if 'email' in df.columns:
-        df['email'] = df['email'].astype(str).str.strip().str.lower()
-        return df[df['email'] == str(email).strip().lower()]
-    return pd.DataFrame()
+    values = ws.get_all_values()
+    if len(values) < 2: return 0
+    rows = [(r + [""] * len(ANSWER_HEADER))[:len(ANSWER_HEADER)] for r in values[1:]]
+    latest = {}
+    for idx, r in enumerate(rows):
+        latest[(str(r[0]).strip().lower(), _item_key(r[1], r[2]))] = idx
+    keep = sorted(latest.values())
+    removed = len(rows) - len(keep)
+    if removed == 0: return 0
+    # 살아남은 행을 앞에서부터 덮어쓴 뒤, 읽어온 범위의 꼬리만 삭제.
+    # 꼬리는 원래 순서의 접미사이므로 중간 상태에서도 last-write-wins 결과가 같고,
+    # 작업 중 추가된 행(읽은 범위 이후)은 그대로 보존됨.
+    # 단, 행 번호가 앞서 읽은 값에 의존하므로 반드시 한 번에 하나만 실행해야 함 (run_compaction)
+    ws.update(range_name=f"A1:F{len(keep) + 1}", values=[ANSWER_HEADER] + [rows[i] for i in keep])
+    ws.delete_rows(len(keep) + 2, len(rows) + 1)
+    return removed
+
+@st.cache_resource
+def _compact_lock():
+    return threading.Lock()
+
+def _acquire_compact_lease(sh, owner):
+    # meta 시트 A1:B1 = (실행 중인 작업 ID, 만료 시각). 여러 인스턴스 사이의 임대(lease)
+    try:
+        ws = sh.worksheet("meta")
+    except gspread.exceptions.WorksheetNotFound:
+        ws = sh.add_worksheet(title="meta", rows=1, cols=3)
+    cur = (ws.get("A1:B1") or [[]])[0] + ["", ""]
+    try:
+        expires = float(cur[1])
+    except ValueError:
+        expires = 0.0
+    if cur[0] and expires > time.time(): return None
+    ws.update(range_name="A1:B1", values=[[owner, time.time() + COMPACT_LEASE]])
+    # 동시에 획득을 시도한 경우 마지막에 기록한 쪽만 진행
+    time.sleep(2)
+    if ws.acell("A1").value != owner: return None
+    return ws
+
+def run_compaction():
+    lock = _compact_lock()
+    if not lock.acquire(blocking=False): return None
+    try:
+        sh = get_db_connection()
+        owner = uuid.uuid4().hex
+        lease = _acquire_compact_lease(sh, owner)
+        if lease is None: return None
+        try:
+            removed = compact_answers(sh)
+            lease.update(range_name="C1", values=[[time.strftime("%Y-%m-%d %H:%M:%S")]])
+            logger.info("answers 시트 정리 완료: %d행 제거", removed)
+            return removed
+        finally:
+            lease.update(range_name="A1:B1", values=[["", ""]])
+    except Exception:
+        logger.exception("answers 시트 정리 실패")
+        raise
+    finally:
+        lock.release()
 
 # ==========================================
 # 2. 채점 및 기초 데이터 가공
 # ==========================================
 def calculate_results(email):
-    student_ans_df = load_student_answers(email)
-    key_df = load_answer_key()
+    student_ans = load_student_answers(email)
+    answer_key = load_answer_key()
     results = []
     
-    if student_ans_df.empty: return pd.DataFrame()
+    if len(student_ans.item) == 0: return pd.DataFrame()
 
-    for _, row in student_ans_df.iterrows():
-        part = str(row['part'])
-        q_id = str(row['q_id'])
-        user_ans = str(row['answer']).strip()
-        conf = row['confidence']
+    for item, user_ans, conf_code in zip(student_ans.item, student_ans.answer, student_ans.confidence):
+        part, q_id = student_ans.catalog[item]
+        conf = CONFIDENCE_LEVELS[conf_code] if conf_code >= 0 else ""
         
-        key_row = key_df[(key_df['part'] == part) & (key_df['q_id'] == q_id)]
-        if key_row.empty: continue
+        if _item_key(part, q_id) not in answer_key: continue
             
-        correct_ans = str(key_row.iloc[0]['answer']).strip()
-        grading_type = key_row.iloc[0]['grading_type']
-        keywords = str(key_row.iloc[0]['keywords'])
+        correct_ans, grading_type, keywords = answer_key[_item_key(part, q_id)]
         
         is_correct = False
         if grading_type == 'exact':
@@ -511,7 +752,21 @@ if 'user_name' not in st.session_state: st.session_state['user_name'] = None
 if 'current_part' not in st.session_state: st.session_state['current_part'] = 1
 if 'view_mode' not in st.session_state: st.session_state['view_mode'] = False
 
-if st.session_state['user_email'] is None:
+admin_token = st.secrets.get("admin_token")
+if admin_token and st.query_params.get("admin") == admin_token:
+    st.title("🛠️ 관리자")
+    st.caption("answers 시트에서 같은 (이메일, 파트, 문항)의 이전 제출 행을 제거합니다.")
+    if st.button("답안 시트 정리"):
+        try:
+            with st.spinner("정리 중..."):
+                removed = run_compaction()
+            if removed is None: st.warning("다른 정리 작업이 진행 중입니다. 잠시 후 다시 시도하세요.")
+            else: st.success(f"{removed}개 행을 정리했습니다.")
+        except Exception as e: st.error(f"정리 중 오류: {e}")
+    st.subheader("메모리 사용량 (bytes)")
+    st.json({"students": load_student_store().memory_usage(), "answers": load_answer_store().memory_usage()})
+
+elif st.session_state['user_email'] is None:
     st.title("🎓 영어 역량 정밀 진단고사")
     st.info("로그인 시 이메일 주소를 사용합니다.")
     tab1, tab2 = st.tabs(["시험 응시", "결과 확인"])
@@ -526,23 +781,28 @@ if st.session_state['user_email'] is None:
             if st.form_submit_button("시작하기"):
                 if name and email and "@" in email:
                     sch = c_sch if s_opt == "직접 입력" else s_opt
-                    stu = get_student(name, email)
-                    if stu: st.session_state['current_part'] = 9 if stu['last_part']>8 else stu['last_part']
-                    else: save_student(name, email, sch, grade)
-                    st.session_state['user_name'] = name; st.session_state['user_email'] = email; st.rerun()
+                    try:
+                        stu = get_student(name, email)
+                        if stu: st.session_state['current_part'] = 9 if stu['last_part']>8 else stu['last_part']
+                        else: save_student(name, email, sch, grade)
+                        st.session_state['user_name'] = name; st.session_state['user_email'] = email; st.rerun()
+                    except Exception as e: st.error(f"오류: {e}")
                 else: st.error("정보를 정확히 입력하세요.")
     with tab2:
         with st.form("check"):
             n = st.text_input("이름"); e = st.text_input("이메일")
             if st.form_submit_button("조회"):
-                if get_student(n, e):
-                    st.session_state['user_name'] = n; st.session_state['user_email'] = e; st.session_state['view_mode'] = True; st.rerun()
-                else: st.error("이력이 없습니다.")
+                try:
+                    if get_student(n, e):
+                        st.session_state['user_name'] = n; st.session_state['user_email'] = e; st.session_state['view_mode'] = True; st.rerun()
+                    else: st.error("이력이 없습니다.")
+                except Exception as err: st.error(f"오류: {err}")
 
 elif not st.session_state['view_mode'] and st.session_state['current_part'] <= 8:
     part = st.session_state['current_part']
     info = EXAM_STRUCTURE[part]
     st.title(info['title']); st.progress(part/8)
+    if f"submission_id_{part}" not in st.session_state: st.session_state[f"submission_id_{part}"] = new_submission_id(part)
     if part == 8: st.error("⚠️ 서술형 주의: 마침표(.) 필수, 띄어쓰기 주의")
     
     with st.form(f"exam_{part}"):
@@ -611,6 +871,7 @@ elif not st.session_state['view_mode'] and st.session_state['current_part'] <= 8
                     if not a: is_valid = False
                     final_data.append({'q_id':str(i), 'ans':a, 'conf':c})
             elif info['type'] == 'part2_special':
+                # q_id는 EXAM_ITEMS[2] 목록과 반드시 일치해야 함
                 for i in range(1,10):
                     a = st.session_state.get(f"p2_q{i}",""); c = st.session_state.get(f"p2_c{i}","모름")
                     if not a: is_valid = False
@@ -619,6 +880,7 @@ elif not st.session_state['view_mode'] and st.session_state['current_part'] <= 8
                 if not w or not o: is_valid = False
                 final_data.append({'q_id':'10_wrong','ans':w,'conf':c}); final_data.append({'q_id':'10_correct','ans':o,'conf':c})
             elif info['type'] == 'part3_special':
+                # q_id는 EXAM_ITEMS[3] 목록과 반드시 일치해야 함
                 s1=st.session_state.get("p3_q1_subj",""); v1=st.session_state.get("p3_q1_verb",""); o1=st.session_state.get("p3_q1_obj",""); c1=st.session_state.get("p3_c1","모름")
                 if not(s1 and v1 and o1): is_valid=False
                 final_data.extend([{'q_id':'1_subj','ans':s1,'conf':c1},{'q_id':'1_verb','ans':v1,'conf':c1},{'q_id':'1_obj','ans':o1,'conf':c1}])
@@ -640,6 +902,7 @@ elif not st.session_state['view_mode'] and st.session_state['current_part'] <= 8
                     if not a: is_valid=False
                     final_data.append({'q_id':str(i),'ans':a,'conf':c})
             elif info['type'] == 'part5_special':
+                # q_id는 EXAM_ITEMS[5] 목록과 반드시 일치해야 함
                 for i in [1,2,5]:
                     ao=st.session_state.get(f"p5_q{i if i!=5 else 5}_obj",""); at=st.session_state.get(f"p5_q{i if i!=5 else 5}_text",""); c=st.session_state.get(f"p5_c{i if i!=5 else 5}","모름")
                     if not(ao and at): is_valid=False
@@ -668,7 +931,8 @@ elif not st.session_state['view_mode'] and st.session_state['current_part'] <= 8
             else:
                 try:
                     with st.spinner("저장 중..."):
-                        save_answers_bulk(st.session_state['user_email'], part, final_data)
+                        save_answers_bulk(st.session_state['user_email'], part, final_data, st.session_state[f"submission_id_{part}"])
+                        del st.session_state[f"submission_id_{part}"]
                         st.session_state['current_part'] += 1
                         time.sleep(1)
                         st.rerun()